@@ -10,12 +10,21 @@ import os.path as osp
 import subprocess
 import sys
 import tempfile
+import threading
 
 import numpy
 import sklearn.cluster
 
 import pyflann
 
+# Optional approximate nearest-neighbor backend for codebook quantization.
+# Deterministic (unlike the autotuned FLANN index) and logarithmic in codebook
+# size, which matters for large-K codebooks.
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
 from smqtk.algorithms.descriptor_generator import DescriptorGenerator
 from smqtk.representation.data_element.file_element import DataFileElement
 from smqtk.utils import file_utils, SimpleTimer, video_utils
@@ -24,6 +33,123 @@ from smqtk.utils.video_utils import get_metadata_info
 
 # Attempt importing utilities module. If not, flag descriptor as unusable.
 from . import utils
+# Optional Numba-compiled chi-squared assignment kernel; its ``chi2_argmin``
+# is None when Numba is unavailable.
+from . import _chi2_assign
+
+
+# Process-wide cache of file-based data element UUIDs, keyed on the file's
+# (path, mtime, size). DataElement instances cache their own UUID, but a fresh
+# element wrapping an already-seen file would otherwise re-hash the full file
+# bytes just to rebuild a checkpoint path.
+_ELEMENT_UUID_CACHE = {}
+
+
+def _element_uuid(data):
+    """
+    Return ``str(data.uuid())``, serving file-based elements from a
+    process-wide cache so repeat encounters of the same on-disk file skip
+    re-hashing its content.
+
+    :param data: Data element to get the UUID string of.
+    :type data: smqtk.representation.DataElement
+
+    :return: String UUID of the element.
+    :rtype: str
+
+    """
+    if isinstance(data, DataFileElement):
+        try:
+            st = os.stat(data._filepath)
+            key = (data._filepath, st.st_mtime, st.st_size)
+        except OSError:
+            return str(data.uuid())
+        if key not in _ELEMENT_UUID_CACHE:
+            _ELEMENT_UUID_CACHE[key] = str(data.uuid())
+        return _ELEMENT_UUID_CACHE[key]
+    return str(data.uuid())
+
+
+def _subsample_indices(n, k):
+    """
+    Draw ``k`` unique, sorted row indices from ``range(n)``.
+
+    ``RandomState.choice(n, k, replace=False)`` builds a full n-length
+    permutation internally, so it is no cheaper than permuting and keeping
+    the head; we just do the latter directly. The win here is returning the
+    indices sorted, so downstream fancy-indexing of the (possibly
+    memory-mapped) matrices reads rows in file order.
+
+    :param n: Population size.
+    :type n: int
+
+    :param k: Sample size. Must be <= n.
+    :type k: int
+
+    :return: Sorted list of k unique indices.
+    :rtype: list[int]
+
+    """
+    return sorted(numpy.random.permutation(int(n))[:int(k)])
+
+
+def _cd_frame_descriptor_job(task):
+    """
+    Run colorDescriptor generation for a single video frame image.
+
+    Runs on thread pool workers (the work is dominated by the
+    colorDescriptor subprocess, during which the GIL is released).
+    Generation failures are returned rather than raised so that one bad frame
+    does not abort an unordered result stream.
+
+    :param task: Tuple of (video UID, frame number, executable, frame image
+        path, descriptor type, info matrix path, descriptor matrix path).
+    :type task: tuple
+
+    :return: Tuple of (video UID, frame number, info matrix shape, descriptor
+        matrix shape, error message or None).
+    :rtype: tuple
+
+    """
+    uid, frame, exe, img_path, descriptor_type, info_fp, desc_fp = task
+    try:
+        i_shape, d_shape = utils.generate_descriptors(
+            exe, img_path, descriptor_type, info_fp, desc_fp
+        )
+    except RuntimeError, ex:
+        return uid, frame, None, None, str(ex)
+    return uid, frame, i_shape, d_shape, None
+
+
+def _pq_kmeans_fit(args):
+    """
+    Fit MiniBatchKMeans over a single product-quantization subspace.
+
+    Module-level function so it can be pickled to pool worker processes.
+
+    :param args: Tuple of (descriptor subspace slice, number of clusters,
+        random seed, verbosity flag).
+    :type args: (numpy.core.multiarray.ndarray, int, None | int, bool)
+
+    :return: Cluster centers matrix for the subspace.
+    :rtype: numpy.core.multiarray.ndarray
+
+    """
+    sub_descriptors, n_clusters, random_seed, verbose = args
+    # Subspace slices of the parent matrix are not contiguous; convert here
+    # rather than letting sklearn allocate the copy internally.
+    sub_descriptors = numpy.ascontiguousarray(sub_descriptors,
+                                              dtype=numpy.float32)
+    kmeans = sklearn.cluster.MiniBatchKMeans(
+        n_clusters=n_clusters,
+        init_size=n_clusters * 3,
+        batch_size=max(4096, 10 * n_clusters),
+        random_state=random_seed,
+        verbose=verbose,
+        compute_labels=False,
+    )
+    kmeans.fit(sub_descriptors)
+    return kmeans.cluster_centers_
 
 
 # noinspection PyPep8Naming
@@ -47,6 +173,10 @@ class ColorDescriptor_Base (DescriptorGenerator):
     # its accessible on the PATH.
     EXE = 'colorDescriptor'
 
+    # Number of centroids trained per subspace when product quantization is
+    # enabled (see the ``pq_subspaces`` constructor parameter).
+    PQ_CLUSTERS = 256
+
     @classmethod
     def is_usable(cls):
         """
@@ -107,6 +237,8 @@ class ColorDescriptor_Base (DescriptorGenerator):
                  flann_sample_fraction=0.75,
                  flann_autotune=False,
                  random_seed=None, use_spatial_pyramid=False,
+                 use_sq8_codebook=False,
+                 pq_subspaces=None,
                  parallel=None):
         """
         Initialize a new ColorDescriptor interface instance.
@@ -158,6 +290,23 @@ class ColorDescriptor_Base (DescriptorGenerator):
             level descriptors during feature computation.
         :type use_spatial_pyramid: bool
 
+        :param use_sq8_codebook: Use a scalar-quantized (int8) copy of the
+            codebook for descriptor quantization. This quarters the memory
+            streamed through the assignment kernel at the cost of quantization
+            rounding. Only applies to the euclidean distance metric; other
+            metrics ignore this option.
+        :type use_sq8_codebook: bool
+
+        :param pq_subspaces: When set, use product quantization: the
+            descriptor space is split into this many contiguous subspaces and
+            a ``PQ_CLUSTERS``-centroid codebook is trained per subspace
+            instead of one flat ``kmeans_k`` codebook. Assignment then reduces
+            to small per-subspace argmins and the output feature is the
+            concatenation of per-subspace histograms (length
+            ``pq_subspaces * PQ_CLUSTERS``). Mutually exclusive with
+            ``use_spatial_pyramid``.
+        :type pq_subspaces: None | int
+
         :param parallel: Specific number of threads/cores to use when performing
             asynchronous activities. When None we will use all cores available.
         :type parallel: int | None
@@ -171,6 +320,15 @@ class ColorDescriptor_Base (DescriptorGenerator):
         #       the class be regenerated from an existing codebook?
         self._model_dir = model_directory
         self._work_dir = work_directory
+        # Create the model and work directories once up front. The filepath
+        # property accessors are hit inside per-element/per-frame loops and
+        # should not repeat the stat+mkdir syscalls on every access.
+        file_utils.safe_create_dir(self._model_dir)
+        file_utils.safe_create_dir(self._work_dir)
+        self._temp_dir = None
+        # Checkpoint directories already ensured on disk (see
+        # ``_get_checkpoint_dir``).
+        self._prepared_dirs = set()
 
         self._model_gen_descriptor_limit = model_gen_descriptor_limit
 
@@ -180,6 +338,14 @@ class ColorDescriptor_Base (DescriptorGenerator):
         self._flann_sample_fraction = float(flann_sample_fraction)
         self._flann_autotune = bool(flann_autotune)
         self._use_sp = use_spatial_pyramid
+        self._use_sq8 = bool(use_sq8_codebook)
+        self._pq_m = None if pq_subspaces is None else int(pq_subspaces)
+        if self._pq_m is not None and self._pq_m <= 0:
+            raise ValueError("pq_subspaces must be a positive integer when "
+                             "provided (given: %s)" % pq_subspaces)
+        if self._pq_m and self._use_sp:
+            raise ValueError("Product quantization and spatial pyramid "
+                             "quantization are mutually exclusive")
         self._rand_seed = None if random_seed is None else int(random_seed)
 
         if self._rand_seed is not None:
@@ -187,11 +353,32 @@ class ColorDescriptor_Base (DescriptorGenerator):
 
         self.parallel = parallel
 
-        # Cannot pre-load FLANN stuff because odd things happen when processing/
-        # threading. Loading index file is fast anyway.
+        # Lazily created worker pools, keyed on requested size and reused
+        # across descriptor matrix generation calls (see ``_get_proc_pool``
+        # / ``_get_thread_pool``). Creation is serialized by the lock since
+        # compute_descriptor_async drives _compute_descriptor from multiple
+        # threads of one instance.
+        self._pool_lock = threading.Lock()
+        self._proc_pools = {}
+        self._thread_pools = {}
+
+        # FLANN index is loaded lazily and cached per thread and process
+        # (see ``_get_flann``); pre-loading here would hand a single index
+        # handle across fork boundaries, where odd things happen.
+        self._flann_local = threading.local()
         self._codebook = None
+        # Lazily cached contiguous float32 codebook + row squared-norms for
+        # direct NumPy quantization (see ``_get_codebook_f32``).
+        self._codebook_f32 = None
+        self._codebook_f32_sqnorm = None
+        self._codebook_f32_lock = threading.Lock()
+        # Lazily cached scalar-quantized codebook components (see
+        # ``_get_codebook_sq8``).
+        self._codebook_sq8 = None
+        # Lazily built HNSW index over the codebook (see ``_get_hnsw_index``).
+        self._hnsw_index = None
         if self.has_model:
-            self._codebook = numpy.load(self.codebook_filepath)
+            self._codebook = numpy.load(self.codebook_filepath, mmap_mode='r')
 
     def get_config(self):
         """
@@ -217,8 +404,93 @@ class ColorDescriptor_Base (DescriptorGenerator):
             "flann_autotune": self._flann_autotune,
             "random_seed": self._rand_seed,
             "use_spatial_pyramid": self._use_sp,
+            "use_sq8_codebook": self._use_sq8,
+            "pq_subspaces": self._pq_m,
         }
 
+    def _get_proc_pool(self, processes=None):
+        """
+        Lazily create and reuse a process pool of the given size.
+
+        Pool construction forks workers per call otherwise, and that churn
+        (fork + interpreter setup per pool) dominates when descriptor matrix
+        generation is invoked once per element. A persistent pool pays that
+        cost once per requested size.
+
+        Pools are cached per size and never closed for the life of the
+        instance: ``compute_descriptor_async`` runs ``_compute_descriptor``
+        concurrently in threads of one instance, so closing a
+        differently-sized pool here could tear it out from under another
+        thread mid-map. Creation is guarded by ``_pool_lock`` for the same
+        reason.
+
+        :param processes: Number of worker processes, or None to follow the
+            ``parallel`` setting.
+        :type processes: int | None
+
+        :return: Cached process pool.
+        :rtype: multiprocessing.pool.Pool
+
+        """
+        processes = processes or self.parallel
+        with self._pool_lock:
+            pool = self._proc_pools.get(processes)
+            if pool is None:
+                pool = multiprocessing.Pool(processes=processes)
+                self._proc_pools[processes] = pool
+        return pool
+
+    def _get_thread_pool(self, processes=None):
+        """
+        Lazily create and reuse a thread pool of the given size.
+
+        Cached per size and never closed for the life of the instance, under
+        the same locking discipline as ``_get_proc_pool`` and for the same
+        concurrent-caller reasons.
+
+        :param processes: Number of worker threads, or None to follow the
+            ``parallel`` setting.
+        :type processes: int | None
+
+        :return: Cached thread pool.
+        :rtype: multiprocessing.pool.ThreadPool
+
+        """
+        processes = processes or self.parallel
+        with self._pool_lock:
+            pool = self._thread_pools.get(processes)
+            if pool is None:
+                pool = multiprocessing.pool.ThreadPool(processes=processes)
+                self._thread_pools[processes] = pool
+        return pool
+
+    def __getstate__(self):
+        """
+        Drop per-process runtime caches (worker pools, locks and lazily
+        derived codebook forms) when pickling. They are rebuilt on demand in
+        the receiving process.
+        """
+        state = self.__dict__.copy()
+        state['_pool_lock'] = None
+        state['_proc_pools'] = None
+        state['_thread_pools'] = None
+        state['_codebook'] = None
+        state['_codebook_f32'] = None
+        state['_codebook_f32_sqnorm'] = None
+        state['_codebook_f32_lock'] = None
+        state['_codebook_sq8'] = None
+        state['_hnsw_index'] = None
+        state['_flann_local'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._codebook_f32_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        self._proc_pools = {}
+        self._thread_pools = {}
+        self._flann_local = threading.local()
+
     @property
     def name(self):
         if self._use_sp:
@@ -228,35 +500,51 @@ class ColorDescriptor_Base (DescriptorGenerator):
 
     @property
     def codebook_filepath(self):
-        file_utils.safe_create_dir(self._model_dir)
         return osp.join(self._model_dir,
                         "%s.codebook.npy" % (self.descriptor_type(),))
 
+    @property
+    def codebook_sq8_filepath(self):
+        return osp.join(self._model_dir,
+                        "%s.codebook.sq8.npz" % (self.descriptor_type(),))
+
     @property
     def flann_index_filepath(self):
-        file_utils.safe_create_dir(self._model_dir)
         return osp.join(self._model_dir,
                         "%s.flann_index.dat" % (self.descriptor_type(),))
 
     @property
     def flann_params_filepath(self):
-        file_utils.safe_create_dir(self._model_dir)
         return osp.join(self._model_dir,
                         "%s.flann_params.json" % (self.descriptor_type(),))
 
     @property
     def has_model(self):
-        has_model = (osp.isfile(self.codebook_filepath) and
-                     osp.isfile(self.flann_index_filepath))
+        # A loaded codebook means the model files were present at load time;
+        # skip re-stat'ing them on every descriptor computation.
+        if self._codebook is not None:
+            return True
+        has_model = osp.isfile(self.codebook_filepath)
+        if not self._pq_m:
+            # Flat-codebook quantization may additionally require the FLANN
+            # index; product quantization never uses one.
+            has_model = has_model and osp.isfile(self.flann_index_filepath)
         # Load the codebook model if not already loaded. FLANN index will be
         # loaded when needed to prevent thread/subprocess memory issues.
+        # - Memory-mapping the read-only codebook shares its pages across the
+        #   worker processes forked for descriptor generation instead of each
+        #   one deserializing a private copy.
         if self._codebook is None and has_model:
-            self._codebook = numpy.load(self.codebook_filepath)
+            self._codebook = numpy.load(self.codebook_filepath, mmap_mode='r')
         return has_model
 
     @property
     def temp_dir(self):
-        return file_utils.safe_create_dir(osp.join(self._work_dir, 'temp_files'))
+        if self._temp_dir is None:
+            self._temp_dir = file_utils.safe_create_dir(
+                osp.join(self._work_dir, 'temp_files')
+            )
+        return self._temp_dir
 
     @abc.abstractmethod
     def descriptor_type(self):
@@ -295,8 +583,14 @@ class ColorDescriptor_Base (DescriptorGenerator):
         :rtype: str
 
         """
-        d = osp.join(self._work_dir, *partition_string(str(data.uuid()), 10))
-        file_utils.safe_create_dir(d)
+        d = osp.join(self._work_dir,
+                     *partition_string(_element_uuid(data), 10))
+        # Element UUIDs partition into a bounded set of directory prefixes, so
+        # without memoization large ingests repeat the same mkdir/stat
+        # syscalls (one per nesting level) for every element and frame.
+        if d not in self._prepared_dirs:
+            file_utils.safe_create_dir(d)
+            self._prepared_dirs.add(d)
         return d
 
     def _get_standard_info_descriptors_filepath(self, data, frame=None):
@@ -317,13 +611,14 @@ class ColorDescriptor_Base (DescriptorGenerator):
         d = self._get_checkpoint_dir(data)
         if frame is not None:
             return (
-                osp.join(d, "%s.info.%d.npy" % (str(data.uuid()), frame)),
-                osp.join(d, "%s.descriptors.%d.npy" % (str(data.uuid()), frame))
+                osp.join(d, "%s.info.%d.npy" % (_element_uuid(data), frame)),
+                osp.join(d, "%s.descriptors.%d.npy" % (_element_uuid(data),
+                                                       frame))
             )
         else:
             return (
-                osp.join(d, "%s.info.npy" % str(data.uuid())),
-                osp.join(d, "%s.descriptors.npy" % str(data.uuid()))
+                osp.join(d, "%s.info.npy" % _element_uuid(data)),
+                osp.join(d, "%s.descriptors.npy" % _element_uuid(data))
             )
 
     def _get_checkpoint_feature_file(self, data):
@@ -341,10 +636,10 @@ class ColorDescriptor_Base (DescriptorGenerator):
         """
         if self._use_sp:
             return osp.join(self._get_checkpoint_dir(data),
-                            "%s.feature.sp.npy" % str(data.uuid()))
+                            "%s.feature.sp.npy" % _element_uuid(data))
         else:
             return osp.join(self._get_checkpoint_dir(data),
-                            "%s.feature.npy" % str(data.uuid()))
+                            "%s.feature.npy" % _element_uuid(data))
 
     def generate_model(self, data_set, **kwargs):
         """
@@ -393,7 +688,8 @@ class ColorDescriptor_Base (DescriptorGenerator):
                 if osp.isfile(descriptors_checkpoint):
                     self._log.debug("Found existing computed descriptors work "
                                     "file for model generation.")
-                    descriptors = numpy.load(descriptors_checkpoint)
+                    descriptors = numpy.load(descriptors_checkpoint,
+                                             allow_pickle=False)
                 else:
                     self._log.debug("Computing model descriptors")
                     _, descriptors = \
@@ -411,51 +707,490 @@ class ColorDescriptor_Base (DescriptorGenerator):
             with SimpleTimer("Computing sklearn.cluster.MiniBatchKMeans...",
                              self._log.info):
                 kmeans_verbose = self._log.getEffectiveLevel <= logging.DEBUG
-                kmeans = sklearn.cluster.MiniBatchKMeans(
-                    n_clusters=self._kmeans_k,
-                    init_size=self._kmeans_k*3,
-                    random_state=self._rand_seed,
-                    verbose=kmeans_verbose,
-                    compute_labels=False,
-                )
-                kmeans.fit(descriptors)
-                codebook = kmeans.cluster_centers_
+                # Hand kmeans a contiguous float32 matrix up front. sklearn
+                # converts internally otherwise, allocating a second full-size
+                # copy at peak, and fancy-indexed subsample output is not
+                # C-contiguous.
+                descriptors = numpy.ascontiguousarray(descriptors,
+                                                      dtype=numpy.float32)
+                if self._pq_m:
+                    codebook = self._fit_pq_codebook(descriptors,
+                                                     kmeans_verbose)
+                else:
+                    kmeans = sklearn.cluster.MiniBatchKMeans(
+                        n_clusters=self._kmeans_k,
+                        init_size=self._kmeans_k*3,
+                        # Batches sized to the codebook keep the per-step
+                        # distance GEMM blocks large enough to be
+                        # BLAS-efficient.
+                        batch_size=max(4096, 10 * self._kmeans_k),
+                        random_state=self._rand_seed,
+                        verbose=kmeans_verbose,
+                        compute_labels=False,
+                    )
+                    kmeans.fit(descriptors)
+                    codebook = kmeans.cluster_centers_
             with SimpleTimer("Saving generated codebook...", self._log.debug):
                 numpy.save(self.codebook_filepath, codebook)
         else:
             self._log.info("Found existing codebook file.")
             codebook = numpy.load(self.codebook_filepath)
 
+        # Save a scalar-quantized (int8) codebook copy when configured to
+        # quantize descriptors in the int8 domain.
+        if self._use_sq8 and not osp.isfile(self.codebook_sq8_filepath):
+            with SimpleTimer("Saving scalar-quantized codebook...",
+                             self._log.debug):
+                scale, offset = self._sq8_params(codebook)
+                numpy.savez(self.codebook_sq8_filepath,
+                            codebook_i8=self._sq8_quantize(codebook, scale,
+                                                           offset),
+                            scale=scale, offset=offset)
+
         # create FLANN index
         # - autotune will force select linear search if there are < 1000 words
         #   in the codebook vocabulary.
-        pyflann.set_distance_type(self._flann_distance_metric)
-        flann = pyflann.FLANN()
-        if self._log.getEffectiveLevel() <= logging.DEBUG:
-            log_level = 'info'
-        else:
-            log_level = 'warning'
-        with SimpleTimer("Building FLANN index...", self._log.info):
-            p = {
-                "target_precision": self._flann_target_precision,
-                "sample_fraction": self._flann_sample_fraction,
-                "log_level": log_level,
-            }
-            if self._flann_autotune:
-                p['algorithm'] = "autotuned"
-            if self._rand_seed is not None:
-                p['random_seed'] = self._rand_seed
-            flann_params = flann.build_index(codebook, **p)
-        with SimpleTimer("Saving FLANN index to file...", self._log.debug):
-            # Save FLANN index data binary
-            flann.save_index(self.flann_index_filepath)
-            # Save out log of parameters
-            with open(self.flann_params_filepath, 'w') as ofile:
-                json.dump(flann_params, ofile, indent=4, sort_keys=True)
+        # - Product quantization assigns descriptors with per-subspace NumPy
+        #   argmins and has no use for a FLANN index.
+        if not self._pq_m:
+            pyflann.set_distance_type(self._flann_distance_metric)
+            flann = pyflann.FLANN()
+            if self._log.getEffectiveLevel() <= logging.DEBUG:
+                log_level = 'info'
+            else:
+                log_level = 'warning'
+            with SimpleTimer("Building FLANN index...", self._log.info):
+                p = {
+                    "target_precision": self._flann_target_precision,
+                    "sample_fraction": self._flann_sample_fraction,
+                    "log_level": log_level,
+                }
+                if self._flann_autotune:
+                    p['algorithm'] = "autotuned"
+                if self._rand_seed is not None:
+                    p['random_seed'] = self._rand_seed
+                flann_params = flann.build_index(codebook, **p)
+            with SimpleTimer("Saving FLANN index to file...", self._log.debug):
+                # Save FLANN index data binary
+                flann.save_index(self.flann_index_filepath)
+                # Save out log of parameters
+                with open(self.flann_params_filepath, 'w') as ofile:
+                    json.dump(flann_params, ofile, indent=4, sort_keys=True)
 
         # save generation results to class for immediate feature computation use
         self._codebook = codebook
 
+    def _fit_pq_codebook(self, descriptors, verbose):
+        """
+        Fit the product-quantization codebook: one ``PQ_CLUSTERS``-centroid
+        MiniBatchKMeans per contiguous descriptor slice of width
+        ``D / pq_subspaces``.
+
+        :raises ValueError: Descriptor dimensionality does not evenly divide
+            into the configured number of subspaces.
+
+        :param descriptors: Descriptor matrix (N x D) to cluster.
+        :type descriptors: numpy.core.multiarray.ndarray
+
+        :param verbose: Verbosity flag passed to MiniBatchKMeans.
+        :type verbose: bool
+
+        :return: (pq_subspaces x PQ_CLUSTERS x D/pq_subspaces) codebook array.
+        :rtype: numpy.core.multiarray.ndarray
+
+        """
+        d = descriptors.shape[1]
+        if d % self._pq_m:
+            raise ValueError("Descriptor dimensionality (%d) is not divisible "
+                             "into %d product-quantization subspaces"
+                             % (d, self._pq_m))
+        sub_d = d // self._pq_m
+        tasks = [(descriptors[:, j * sub_d:(j + 1) * sub_d],
+                  self.PQ_CLUSTERS, self._rand_seed, verbose)
+                 for j in xrange(self._pq_m)]
+        if self.parallel != 1 and self._pq_m > 1:
+            # The subspace fits are independent, so run one per worker
+            # process. Workers inherit the parent's BLAS/OpenMP thread
+            # configuration through fork (those libraries read their env vars
+            # at load time, so it cannot be changed here); with the MKL/
+            # OpenBLAS default of one pool per process this oversubscribes
+            # cores somewhat, but the concurrent fits still beat running the
+            # subspaces sequentially.
+            pool = multiprocessing.Pool(
+                processes=min(self._pq_m,
+                              self.parallel or multiprocessing.cpu_count())
+            )
+            try:
+                sub_codebooks = pool.map(_pq_kmeans_fit, tasks)
+            finally:
+                pool.close()
+                pool.join()
+        else:
+            sub_codebooks = map(_pq_kmeans_fit, tasks)
+        return numpy.array(sub_codebooks)
+
+    # Number of descriptor rows to process at a time in the blocked NumPy
+    # quantization methods, keeping per-block temporaries cache-resident.
+    QUANTIZE_BLOCK_SIZE = 4096
+
+    def _get_codebook_f32(self):
+        """
+        Lazily cache and return a C-contiguous float32 copy of the codebook
+        along with the squared L2 norm of each code, for use by the direct
+        NumPy quantization methods.
+
+        :return: Contiguous float32 codebook and squared norms of its rows.
+        :rtype: (numpy.core.multiarray.ndarray, numpy.core.multiarray.ndarray)
+
+        """
+        if self._codebook_f32 is None:
+            with self._codebook_f32_lock:
+                if self._codebook_f32 is None:
+                    cb = numpy.ascontiguousarray(self._codebook,
+                                                 dtype=numpy.float32)
+                    # Summing over the last axis handles both the flat (K x D)
+                    # and product-quantization (m x K x D/m) codebook layouts.
+                    self._codebook_f32_sqnorm = (cb ** 2).sum(axis=-1)
+                    self._codebook_f32 = cb
+        return self._codebook_f32, self._codebook_f32_sqnorm
+
+    def _quantize_l2(self, descriptors):
+        """
+        Assign each descriptor to the nearest code under L2 distance using one
+        BLAS matrix product per block.
+
+        Since ``||x - c||^2 == ||x||^2 + ||c||^2 - 2*(x . c)`` and the
+        ``||x||^2`` term is constant per descriptor, it cannot affect the
+        argmin and is dropped.
+
+        :param descriptors: Descriptor matrix (N x D).
+        :type descriptors: numpy.core.multiarray.ndarray
+
+        :return: Index of the nearest code for each descriptor (N).
+        :rtype: numpy.core.multiarray.ndarray
+
+        """
+        cb, cb_sqnorm = self._get_codebook_f32()
+        x = numpy.ascontiguousarray(descriptors, dtype=numpy.float32)
+        idxs = numpy.empty(x.shape[0], dtype=numpy.intp)
+        b = self.QUANTIZE_BLOCK_SIZE
+        for i in xrange(0, x.shape[0], b):
+            block = x[i:i + b]
+            # (B x K) partial distances; ||x||^2 omitted as noted above.
+            d2 = cb_sqnorm - 2.0 * numpy.dot(block, cb.T)
+            idxs[i:i + b] = d2.argmin(axis=1)
+        return idxs
+
+    @staticmethod
+    def _sq8_params(codebook):
+        """
+        Affine parameters mapping codebook values onto the int8 range.
+
+        A single global scale/offset pair is used rather than per-dimension
+        parameters so that L2 comparisons in the quantized domain stay in pure
+        integer arithmetic while preserving the argmin.
+
+        :param codebook: Codebook matrix to derive parameters from.
+        :type codebook: numpy.core.multiarray.ndarray
+
+        :return: Scale and offset values.
+        :rtype: (float, float)
+
+        """
+        mn = float(codebook.min())
+        mx = float(codebook.max())
+        offset = (mn + mx) / 2.0
+        scale = max((mx - mn) / 254.0, 1e-12)
+        return scale, offset
+
+    @staticmethod
+    def _sq8_quantize(m, scale, offset):
+        """
+        Scalar-quantize an array into int8 with the given affine parameters.
+
+        :param m: Array to quantize.
+        :type m: numpy.core.multiarray.ndarray
+
+        :param scale: Quantization scale.
+        :type scale: float
+
+        :param offset: Quantization offset.
+        :type offset: float
+
+        :return: int8 quantized array of the same shape.
+        :rtype: numpy.core.multiarray.ndarray
+
+        """
+        q = numpy.round((numpy.asarray(m, dtype=numpy.float64) - offset)
+                        / scale)
+        return numpy.clip(q, -128, 127).astype(numpy.int8)
+
+    def _get_codebook_sq8(self):
+        """
+        Lazily cache and return scalar-quantized codebook components: an int32
+        copy of the int8 codebook (for overflow-safe dot products), per-code
+        squared norms, and the affine parameters shared with descriptor-side
+        quantization.
+
+        Loads the persisted sq8 file when present, otherwise derives the
+        quantized copy from the loaded float codebook (deterministic either
+        way).
+
+        :return: int32 quantized codebook, per-code squared norms, scale and
+            offset.
+        :rtype: (numpy.core.multiarray.ndarray, numpy.core.multiarray.ndarray,
+            float, float)
+
+        """
+        if self._codebook_sq8 is None:
+            if osp.isfile(self.codebook_sq8_filepath):
+                npz = numpy.load(self.codebook_sq8_filepath)
+                cb_i8 = npz['codebook_i8']
+                scale = float(npz['scale'])
+                offset = float(npz['offset'])
+            else:
+                scale, offset = self._sq8_params(self._codebook)
+                cb_i8 = self._sq8_quantize(self._codebook, scale, offset)
+            cb_i32 = cb_i8.astype(numpy.int32)
+            cb_sqnorm = (cb_i32.astype(numpy.int64) ** 2).sum(axis=1)
+            self._codebook_sq8 = (cb_i32, cb_sqnorm, scale, offset)
+        return self._codebook_sq8
+
+    def _quantize_l2_sq8(self, descriptors):
+        """
+        L2 nearest-code assignment in the scalar-quantized (int8) domain.
+
+        Descriptors are quantized with the same affine parameters as the
+        codebook, after which distance comparison is integer arithmetic:
+        ``||xq - cq||^2`` up to the per-descriptor ``||xq||^2`` term, which is
+        constant and dropped from the argmin as in the float path.
+
+        :param descriptors: Descriptor matrix (N x D).
+        :type descriptors: numpy.core.multiarray.ndarray
+
+        :return: Index of the nearest code for each descriptor (N).
+        :rtype: numpy.core.multiarray.ndarray
+
+        """
+        cb_i32, cb_sqnorm, scale, offset = self._get_codebook_sq8()
+        xq = self._sq8_quantize(descriptors, scale,
+                                offset).astype(numpy.int32)
+        idxs = numpy.empty(xq.shape[0], dtype=numpy.intp)
+        b = self.QUANTIZE_BLOCK_SIZE
+        for i in xrange(0, xq.shape[0], b):
+            cross = numpy.dot(xq[i:i + b], cb_i32.T)
+            d2 = cb_sqnorm - 2 * cross.astype(numpy.int64)
+            idxs[i:i + b] = d2.argmin(axis=1)
+        return idxs
+
+    def _quantize_chi2(self, descriptors):
+        """
+        Assign each descriptor to the nearest code under the chi-squared
+        distance, ``sum((x - c)^2 / (x + c))``.
+
+        Uses the Numba loop kernel when that optional dependency is present
+        (SIMD inner loop, parallel over descriptors, no broadcast
+        temporaries), otherwise falls back to blockwise NumPy broadcasting.
+
+        :param descriptors: Descriptor matrix (N x D).
+        :type descriptors: numpy.core.multiarray.ndarray
+
+        :return: Index of the nearest code for each descriptor (N).
+        :rtype: numpy.core.multiarray.ndarray
+
+        """
+        cb, _ = self._get_codebook_f32()
+        x = numpy.ascontiguousarray(descriptors, dtype=numpy.float32)
+        if _chi2_assign.chi2_argmin is not None:
+            return _chi2_assign.chi2_argmin(x, cb)
+        idxs = numpy.empty(x.shape[0], dtype=numpy.intp)
+        # Much smaller block than the L2 path since broadcasting materializes
+        # (B x K x D) temporaries per block.
+        b = max(1, self.QUANTIZE_BLOCK_SIZE // 256)
+        # Guard against 0/0 when a descriptor and code bin are both zero.
+        eps = numpy.float32(1e-10)
+        for i in xrange(0, x.shape[0], b):
+            block = x[i:i + b, numpy.newaxis, :]
+            denom = block + cb[numpy.newaxis, :, :]
+            diff = block - cb[numpy.newaxis, :, :]
+            numpy.multiply(diff, diff, out=diff)
+            diff /= denom + eps
+            idxs[i:i + b] = diff.sum(axis=2).argmin(axis=1)
+        return idxs
+
+    # Only route quantization through the HNSW index for codebooks at least
+    # this large. Below this, the exact blocked BLAS scan is both faster and
+    # exact, so the approximate index buys nothing.
+    HNSW_MIN_CODEBOOK_SIZE = 4096
+
+    def _get_hnsw_index(self):
+        """
+        Lazily build and cache an HNSW index over the codebook for
+        logarithmic nearest-code lookup.
+
+        For the chi-squared metric the codebook is indexed under the
+        Hellinger transform (element-wise square root), under which L2
+        distance closely tracks chi-squared rank order for the relative
+        frequency histograms colorDescriptor emits; query vectors must be
+        transformed the same way. The result is a deterministic approximate
+        assignment, unlike the autotuned FLANN chi-square index.
+
+        :return: Populated ``hnswlib.Index`` ready for querying.
+        :rtype: hnswlib.Index
+
+        """
+        if self._hnsw_index is None:
+            with self._codebook_f32_lock:
+                if self._hnsw_index is None:
+                    cb = numpy.ascontiguousarray(self._codebook,
+                                                 dtype=numpy.float32)
+                    if self._flann_distance_metric in ('chi_square', 'cs'):
+                        cb = numpy.sqrt(cb)
+                    index = hnswlib.Index(space='l2', dim=cb.shape[1])
+                    index.init_index(max_elements=cb.shape[0], M=16,
+                                     ef_construction=200)
+                    index.add_items(cb)
+                    index.set_ef(64)
+                    self._hnsw_index = index
+        return self._hnsw_index
+
+    def _quantize_hnsw(self, descriptors):
+        """
+        Assign each descriptor to its (approximate) nearest code via the
+        cached HNSW index.
+
+        :param descriptors: Descriptor matrix (N x D).
+        :type descriptors: numpy.core.multiarray.ndarray
+
+        :return: Index of the nearest code for each descriptor (N).
+        :rtype: numpy.core.multiarray.ndarray
+
+        """
+        index = self._get_hnsw_index()
+        x = numpy.ascontiguousarray(descriptors, dtype=numpy.float32)
+        if self._flann_distance_metric in ('chi_square', 'cs'):
+            x = numpy.sqrt(x)
+        idxs, _ = index.knn_query(x, k=1)
+        return idxs.ravel().astype(numpy.intp)
+
+    def _quantize_pq(self, descriptors):
+        """
+        Assign each descriptor a code per subspace under the
+        product-quantization codebook, using the same blocked BLAS L2 argmin
+        as the flat path but against each small sub-codebook in turn.
+
+        :raises ValueError: The loaded codebook is not a product-quantization
+            codebook, or descriptor dimensionality does not match it.
+
+        :param descriptors: Descriptor matrix (N x D).
+        :type descriptors: numpy.core.multiarray.ndarray
+
+        :return: (N x pq_subspaces) matrix of nearest sub-code indices.
+        :rtype: numpy.core.multiarray.ndarray
+
+        """
+        cb, cb_sqnorm = self._get_codebook_f32()
+        if cb.ndim != 3:
+            # Happens when pq_subspaces is enabled against a model directory
+            # holding a flat codebook from a non-PQ run: has_model accepts
+            # it, generate_model early-returns, and we end up here.
+            raise ValueError("pq_subspaces is configured (%d) but the loaded "
+                             "codebook is flat (shape %s). Regenerate the "
+                             "model with product quantization enabled, or "
+                             "leave pq_subspaces unset (None) to use the "
+                             "existing codebook." % (self._pq_m, cb.shape))
+        m, k, sub_d = cb.shape
+        x = numpy.ascontiguousarray(descriptors, dtype=numpy.float32)
+        if x.shape[1] != m * sub_d:
+            raise ValueError("Descriptor dimensionality (%d) does not match "
+                             "the product-quantization codebook (%d subspaces "
+                             "x %d dims)" % (x.shape[1], m, sub_d))
+        n = x.shape[0]
+        xs = x.reshape(n, m, sub_d)
+        idxs = numpy.empty((n, m), dtype=numpy.intp)
+        b = self.QUANTIZE_BLOCK_SIZE
+        for j in xrange(m):
+            xj = xs[:, j, :]
+            cbj_t = cb[j].T
+            for i in xrange(0, n, b):
+                d2 = cb_sqnorm[j] - 2.0 * numpy.dot(xj[i:i + b], cbj_t)
+                idxs[i:i + b, j] = d2.argmin(axis=1)
+        return idxs
+
+    def _quantize_descriptors(self, descriptors):
+        """
+        Quantize descriptors against the loaded codebook directly with NumPy
+        when the configured distance metric allows it.
+
+        For the supported metrics this turns quantization into dense array
+        math (one matrix product per block in the L2 case), avoiding the
+        FLANN index load from disk that otherwise happens on every call.
+        When the optional ``hnswlib`` module is available and the flat
+        codebook is large (>= ``HNSW_MIN_CODEBOOK_SIZE``), lookups instead go
+        through a cached HNSW graph index, trading the exact O(K) scan for a
+        deterministic approximate O(log K) search.
+
+        :param descriptors: Descriptor matrix (N x D).
+        :type descriptors: numpy.core.multiarray.ndarray
+
+        :return: Nearest code index per descriptor, or None when the
+            configured distance metric requires the FLANN index (e.g. 'hik',
+            which is a similarity score with special handling).
+        :rtype: numpy.core.multiarray.ndarray | None
+
+        """
+        use_hnsw = (
+            hnswlib is not None
+            and not self._use_sq8
+            and self._codebook is not None
+            and self._codebook.ndim == 2
+            and self._codebook.shape[0] >= self.HNSW_MIN_CODEBOOK_SIZE
+        )
+        if self._flann_distance_metric in ('euclidean', 'l2'):
+            if use_hnsw:
+                return self._quantize_hnsw(descriptors)
+            if self._use_sq8:
+                return self._quantize_l2_sq8(descriptors)
+            return self._quantize_l2(descriptors)
+        elif self._flann_distance_metric in ('chi_square', 'cs'):
+            if use_hnsw:
+                return self._quantize_hnsw(descriptors)
+            return self._quantize_chi2(descriptors)
+        return None
+
+    def _get_flann(self):
+        """
+        Lazily load and cache the FLANN index, one instance per thread and
+        process.
+
+        ``load_index`` reads and parses the full serialized index from disk,
+        which previously happened on every descriptor computation and
+        dominates for short descriptor sets. The cache lives in
+        thread-local storage, re-keyed on the current process ID (same
+        pid pattern as the FLANN nearest-neighbor index plugin) so pool
+        workers that inherit this instance via fork each load their own
+        index once instead of sharing a handle across process boundaries.
+        Thread-locality does double duty: each thread owns its check-then-
+        load slot (``compute_descriptor_async`` calls in here from multiple
+        threads concurrently), and no pyflann handle — whose FLANNParameters
+        struct is mutated per query — is ever shared between threads.
+
+        :return: FLANN instance with the model index loaded.
+        :rtype: pyflann.FLANN
+
+        """
+        tl = self._flann_local
+        pid = multiprocessing.current_process().pid
+        if getattr(tl, 'flann', None) is None or tl.pid != pid:
+            # Module-global distance type needs (re)setting before loading in
+            # this process; subsequent queries use the loaded index's metric.
+            pyflann.set_distance_type(self._flann_distance_metric)
+            flann = pyflann.FLANN()
+            flann.load_index(self.flann_index_filepath, self._codebook)
+            tl.flann = flann
+            tl.pid = pid
+        return tl.flann
+
     def _compute_descriptor(self, data):
         """
         Given some kind of data, process and return a feature vector as a Numpy
@@ -491,11 +1226,6 @@ class ColorDescriptor_Base (DescriptorGenerator):
                         data.uuid())
         info, descriptors = self._generate_descriptor_matrices({data})
 
-        # Load FLANN components
-        pyflann.set_distance_type(self._flann_distance_metric)
-        flann = pyflann.FLANN()
-        flann.load_index(self.flann_index_filepath, self._codebook)
-
         if not self._use_sp:
             ###
             # Codebook Quantization
@@ -503,63 +1233,100 @@ class ColorDescriptor_Base (DescriptorGenerator):
             # - loaded the model at class initialization if we had one
             self._log.debug("Quantizing descriptors")
 
-            try:
-                # If the distance method is HIK, we need to treat it special
-                # since that method produces a similarity score, not a distance
-                # score.
-                #
-                if self._flann_distance_metric == 'hik':
-                    # This searches for all NN instead of minimum between n and
-                    # the number of descriptors and keeps the last one because
-                    # hik is a similarity score and not a distance, which is
-                    # also why the values in dists is flipped below.
-                    #: :type: numpy.core.multiarray.ndarray, numpy.core.multiarray.ndarray
-                    idxs = flann.nn_index(descriptors,
-                                          self._codebook.shape[0])[0]
-                    # Only keep the last index for each descriptor return
-                    idxs = numpy.array([i_array[-1] for i_array in idxs])
-                else:
-                    # :type: numpy.core.multiarray.ndarray, numpy.core.multiarray.ndarray
-                    idxs = flann.nn_index(descriptors, 1)[0]
-            except AssertionError:
-
-                self._log.error("Codebook shape  : %s", self._codebook.shape)
-                self._log.error("Descriptor shape: %s", descriptors.shape)
-
-                raise
-
-            # Create histogram
-            # - Using explicit bin slots to prevent numpy from automatically
-            #   creating tightly constrained bins. This would otherwise cause
-            #   histograms between two inputs to be non-comparable (unaligned
-            #   bins).
-            # - See numpy note about ``bins`` to understand why the +1 is
-            #   necessary
-            # - Learned from spatial implementation that we could feed multiple
-            #   neighbors per descriptor into here, leading to a more populated
-            #   histogram.
-            #   - Could also possibly weight things based on dist from
-            #     descriptor?
-            #: :type: numpy.core.multiarray.ndarray
-            h = numpy.histogram(idxs,  # indices are all integers
-                                bins=numpy.arange(self._codebook.shape[0]+1))[0]
+            if self._pq_m:
+                # Product quantization: assign a code per subspace and
+                # concatenate the per-subspace histograms into the output
+                # feature.
+                idxs = self._quantize_pq(descriptors)
+                #: :type: numpy.core.multiarray.ndarray
+                h = numpy.concatenate(
+                    [numpy.bincount(idxs[:, j], minlength=self.PQ_CLUSTERS)
+                     for j in xrange(idxs.shape[1])]
+                )
+            else:
+                idxs = self._quantize_descriptors(descriptors)
+                if idxs is None:
+                    # Metric without a direct NumPy formulation -- fall back
+                    # to the FLANN index.
+                    flann = self._get_flann()
+                    # pyflann requires the query dtype to match the indexed
+                    # data; checkpoints are float32 while pre-existing
+                    # codebooks may be float64 (or vice versa), so align on
+                    # the codebook's dtype.
+                    descriptors = descriptors.astype(self._codebook.dtype,
+                                                     copy=False)
+                    try:
+                        # If the distance method is HIK, we need to treat it
+                        # special since that method produces a similarity
+                        # score, not a distance score.
+                        #
+                        if self._flann_distance_metric == 'hik':
+                            # This searches for all NN instead of minimum
+                            # between n and the number of descriptors and
+                            # keeps the last one because hik is a similarity
+                            # score and not a distance, which is also why the
+                            # values in dists is flipped below.
+                            #: :type: numpy.core.multiarray.ndarray, numpy.core.multiarray.ndarray
+                            idxs = flann.nn_index(descriptors,
+                                                  self._codebook.shape[0])[0]
+                            # Only keep the last index for each descriptor
+                            # return
+                            idxs = numpy.array([i_array[-1]
+                                                for i_array in idxs])
+                        else:
+                            # :type: numpy.core.multiarray.ndarray, numpy.core.multiarray.ndarray
+                            idxs = flann.nn_index(descriptors, 1)[0]
+                    except AssertionError:
+
+                        self._log.error("Codebook shape  : %s",
+                                        self._codebook.shape)
+                        self._log.error("Descriptor shape: %s",
+                                        descriptors.shape)
+
+                        raise
+
+                # Create histogram
+                # - Using bincount instead of numpy.histogram since indices
+                #   are already integer codebook labels in [0, codebook size).
+                #   This is a single-pass counter that avoids constructing the
+                #   bin-edge array and per-element comparisons that histogram
+                #   performs.
+                # - ``minlength`` pins the output length to the codebook size
+                #   so that histograms between two inputs remain comparable
+                #   (aligned bins).
+                # - Learned from spatial implementation that we could feed
+                #   multiple neighbors per descriptor into here, leading to a
+                #   more populated histogram.
+                #   - Could also possibly weight things based on dist from
+                #     descriptor?
+                #: :type: numpy.core.multiarray.ndarray
+                h = numpy.bincount(
+                    numpy.ascontiguousarray(idxs).ravel().astype(numpy.intp,
+                                                                 copy=False),
+                    minlength=self._codebook.shape[0]
+                )
             # self._log.debug("Quantization histogram: %s", h)
             # Normalize histogram into relative frequencies
-            # - Not using /= on purpose. h is originally int32 coming out of
-            #   histogram. /= would keep int32 type when we want it to be
-            #   transformed into a float type by the division.
-            if h.sum():
-                # noinspection PyAugmentAssignment
-                h = h / float(h.sum())
+            # - Keeping the feature in float32: the values are relative
+            #   frequencies, which do not need double precision, and float32
+            #   halves the bytes written to / read from the feature checkpoint
+            #   file (.npy preserves dtype for readers).
+            # - Multiplying by the reciprocal instead of dividing each bin.
+            s = int(h.sum(dtype=numpy.int64))
+            if s:
+                h = h.astype(numpy.float32) * numpy.float32(1.0 / s)
             else:
-                h = numpy.zeros(h.shape, h.dtype)
+                h = numpy.zeros(h.shape, numpy.float32)
             # self._log.debug("Normalized histogram: %s", h)
 
         else:
             ###
             # Spatial Pyramid Quantization
             #
+            # The pyramid path needs ordered k-NN lists per descriptor, which
+            # remains a job for the FLANN index.
             self._log.debug("Quantizing descriptors using spatial pyramid")
+            flann = self._get_flann()
             ##
             # Quantization factor - number of nearest codes to be saved
             q_factor = 10
@@ -581,15 +1348,19 @@ class ColorDescriptor_Base (DescriptorGenerator):
             #   idxs, dists = flann.nn_index(m[:, 2:], q_factor)
             #   q = numpy.concatenate([m[:, :2], idxs, dists], axis=1)
             self._log.debug("Computing nearest neighbors")
+            # pyflann requires the query dtype to match the indexed data;
+            # checkpoints are float32 while pre-existing codebooks may be
+            # float64 (or vice versa), so align on the codebook's dtype.
+            q_block = m[:, 2:].astype(self._codebook.dtype, copy=False)
             if self._flann_distance_metric == 'hik':
                 # Query full ordering of code indices
-                idxs = flann.nn_index(m[:, 2:], self._codebook.shape[0])[0]
+                idxs = flann.nn_index(q_block, self._codebook.shape[0])[0]
                 # Extract the right-side block for use in building histogram
                 # Order doesn't actually matter in the current implementation
                 #   because index relative position is not being weighted.
                 idxs = idxs[:, -q_factor:]
             else:
-                idxs = flann.nn_index(m[:, 2:], q_factor)[0]
+                idxs = flann.nn_index(q_block, q_factor)[0]
             self._log.debug("Creating quantization matrix")
             # This matrix consists of descriptor (x,y) position + near code
             #   indices.
@@ -647,61 +1418,52 @@ class ColorDescriptor_Base (DescriptorGenerator):
         :rtype: numpy.core.multiarray.ndarray
 
         """
-        bins = numpy.arange(0, bins+1)
         cordx = feas[:, 0]
         cordy = feas[:, 1]
-        feas = feas[:, 2:]
+        # Code-index block of the combined matrix is float due to the
+        # concatenation with (x, y); bincount needs integers.
+        codes = feas[:, 2:].astype(numpy.intp)
 
         # hard quantization
-        # global histogram
-        #: :type: numpy.core.multiarray.ndarray
-        hist_sp_g = numpy.histogram(feas, bins=bins)[0]
-        hist_sp_g = hist_sp_g[numpy.newaxis]
-        # 4 quadrants
+        # Region histograms are fused: each descriptor row gets a region
+        # label, and a single bincount over the combined
+        # ``region_id * bins + code`` label space counts every region at
+        # once, replacing one masked pass over the code matrix per region.
+        # Codes lie in [0, bins) so the combined labels pack exactly into
+        # ``n_regions * bins`` aligned slots.
+
+        # 4 quadrants: 2*(lower half) + (right half) numbers them in the
+        # q1 (left-upper), q2 (right-upper), q3 (left-lower), q4
+        # (right-lower) order of the output layout.
         # noinspection PyTypeChecker
         midx = numpy.ceil(cordx.max()/2)
         # noinspection PyTypeChecker
         midy = numpy.ceil(cordy.max()/2)
-        lx = cordx < midx
-        rx = cordx >= midx
-        uy = cordy < midy
-        dy = cordy >= midy
-        # logging.error("LXUI: %s,%s", lx.__repr__(), uy.__repr__())
-        # logging.error("Length LXUI: %s,%s", lx.shape, uy.shape)
-        # logging.error("feas dimensions: %s", feas.shape)
-
-        #: :type: numpy.core.multiarray.ndarray
-        hist_sp_q1 = numpy.histogram(feas[lx & uy], bins=bins)[0]
-        #: :type: numpy.core.multiarray.ndarray
-        hist_sp_q2 = numpy.histogram(feas[rx & uy], bins=bins)[0]
-        #: :type: numpy.core.multiarray.ndarray
-        hist_sp_q3 = numpy.histogram(feas[lx & dy], bins=bins)[0]
+        quad_id = (2 * (cordy >= midy)
+                   + (cordx >= midx)).astype(numpy.intp)
+        hist_sp_q = numpy.bincount(
+            (quad_id[:, numpy.newaxis] * bins + codes).ravel(),
+            minlength=4 * bins
+        ).reshape(4, bins)
+
+        # global histogram: the quadrants partition all descriptors, so
+        # their sum is the global count without a separate pass.
         #: :type: numpy.core.multiarray.ndarray
-        hist_sp_q4 = numpy.histogram(feas[rx & dy], bins=bins)[0]
-        hist_sp_q1 = hist_sp_q1[numpy.newaxis]
-        hist_sp_q2 = hist_sp_q2[numpy.newaxis]
-        hist_sp_q3 = hist_sp_q3[numpy.newaxis]
-        hist_sp_q4 = hist_sp_q4[numpy.newaxis]
+        hist_sp_g = hist_sp_q.sum(axis=0)[numpy.newaxis]
 
-        # 3 layers
+        # 3 layers, fused the same way (layer id = number of thirds
+        # boundaries below the y coordinate).
         # noinspection PyTypeChecker
         ythird = numpy.ceil(cordy.max()/3)
-        l1 = cordy <= ythird
-        l2 = (cordy > ythird) & (cordy <= 2*ythird)
-        l3 = cordy > 2*ythird
-        #: :type: numpy.core.multiarray.ndarray
-        hist_sp_l1 = numpy.histogram(feas[l1], bins=bins)[0]
-        #: :type: numpy.core.multiarray.ndarray
-        hist_sp_l2 = numpy.histogram(feas[l2], bins=bins)[0]
-        #: :type: numpy.core.multiarray.ndarray
-        hist_sp_l3 = numpy.histogram(feas[l3], bins=bins)[0]
-        hist_sp_l1 = hist_sp_l1[numpy.newaxis]
-        hist_sp_l2 = hist_sp_l2[numpy.newaxis]
-        hist_sp_l3 = hist_sp_l3[numpy.newaxis]
+        layer_id = ((cordy > ythird).astype(numpy.intp)
+                    + (cordy > 2*ythird))
+        hist_sp_l = numpy.bincount(
+            (layer_id[:, numpy.newaxis] * bins + codes).ravel(),
+            minlength=3 * bins
+        ).reshape(3, bins)
+
         # concatenate
-        hist_sp = numpy.vstack((hist_sp_g, hist_sp_q1, hist_sp_q2,
-                                hist_sp_q3, hist_sp_q4, hist_sp_l1,
-                                hist_sp_l2, hist_sp_l3))
+        hist_sp = numpy.vstack((hist_sp_g, hist_sp_q, hist_sp_l))
         return hist_sp
 
     def _get_data_temp_path(self, de):
@@ -774,10 +1536,11 @@ class ColorDescriptor_Image (ColorDescriptor_Base):
             finally:
                 # clean temp file
                 di.clean_temp()
-            return numpy.load(info_fp), numpy.load(desc_fp)
+            return (numpy.load(info_fp, allow_pickle=False),
+                    numpy.load(desc_fp, allow_pickle=False))
         else:
             # compute and V-stack matrices for all given images
-            pool = multiprocessing.Pool(processes=self.parallel)
+            pool = self._get_proc_pool()
 
             # Mapping of UID to tuple containing:
             #   (info_fp, desc_fp, async processing result, tmp_clean_method)
@@ -793,7 +1556,6 @@ class ColorDescriptor_Image (ColorDescriptor_Base):
                             self.descriptor_type(), info_fp, desc_fp)
                     r = pool.apply_async(utils.generate_descriptors, args)
                     r_map[di.uuid()] = (info_fp, desc_fp, r, di.clean_temp)
-            pool.close()
 
             # Pass through results from descriptor generation, aggregating
             # matrix shapes.
@@ -833,43 +1595,65 @@ class ColorDescriptor_Image (ColorDescriptor_Base):
                 ssi = None
                 if i_shape[0] > per_item_limit:
                     # pick random indices to subsample down to size limit
-                    ssi = sorted(
-                        numpy.random.permutation(i_shape[0])[:per_item_limit]
-                    )
+                    ssi = _subsample_indices(i_shape[0], per_item_limit)
 
                 # Only keep this if any descriptors were generated
                 r_map[uid] = (ifp, dfp, running_height, ssi)
                 running_height += min(i_shape[0], per_item_limit)
-            pool.join()
 
             # Asynchronously load files, inserting data into master matrices
+            # - float32: the source descriptors are single precision and both
+            #   kmeans and FLANN accept float32, so float64 master matrices
+            #   would just double the memory footprint and bandwidth.
             self._log.debug("Building super matrices...")
-            master_info = numpy.zeros((running_height, i_width), dtype=float)
-            master_desc = numpy.zeros((running_height, d_width), dtype=float)
-            tp = multiprocessing.pool.ThreadPool(processes=self.parallel)
+            master_info = numpy.zeros((running_height, i_width),
+                                      dtype=numpy.float32)
+            master_desc = numpy.zeros((running_height, d_width),
+                                      dtype=numpy.float32)
+            # One flat task list through a single map call: the pure-I/O load
+            # work then crosses the pool's task queue once instead of once per
+            # apply_async submission.
+            load_tasks = []
             for uid in s_keys:
                 if r_map[uid]:
                     ifp, dfp, sR, ssi = r_map[uid]
-                    tp.apply_async(ColorDescriptor_Image._thread_load_matrix,
-                                   args=(ifp, master_info, sR, ssi))
-                    tp.apply_async(ColorDescriptor_Image._thread_load_matrix,
-                                   args=(dfp, master_desc, sR, ssi))
-            tp.close()
-            tp.join()
+                    load_tasks.append((ifp, master_info, sR, ssi))
+                    load_tasks.append((dfp, master_desc, sR, ssi))
+            tp = self._get_thread_pool()
+            tp.map(ColorDescriptor_Image._thread_load_matrix_task, load_tasks)
             return master_info, master_desc
 
+    @staticmethod
+    def _thread_load_matrix_task(task):
+        """
+        Unpack a single (filepath, master matrix, start row, subsample) tuple
+        for use with ``ThreadPool.map``.
+        """
+        filepath, m, sR, subsample = task
+        ColorDescriptor_Image._thread_load_matrix(filepath, m, sR, subsample)
+
     @staticmethod
     def _thread_load_matrix(filepath, m, sR, subsample=None):
         """
         load a numpy matrix from ``filepath``, inserting the loaded matrix into
         ``m`` starting at the row ``sR``.
 
-        If subsample has a value, it will be a list if indices to
+        If subsample has a value, it will be a list of row indices to keep.
         """
-        n = numpy.load(filepath)
+        # Memory-map the source file so rows are streamed straight into the
+        # master matrix slice without an intermediate full read.
+        src = numpy.load(filepath, mmap_mode='r', allow_pickle=False)
         if subsample:
-            n = n[subsample, :]
-        m[sR:sR+n.shape[0], :n.shape[1]] = n
+            out = m[sR:sR+len(subsample), :src.shape[1]]
+            if src.dtype == out.dtype:
+                # Gather the sampled rows directly into the destination slice,
+                # skipping the intermediate fancy-index allocation.
+                numpy.take(src, subsample, axis=0, out=out)
+            else:
+                # dtype conversion on assignment; take cannot fuse the cast.
+                out[:] = src[subsample, :]
+        else:
+            m[sR:sR+src.shape[0], :src.shape[1]] = src
 
 
 # noinspection PyAbstractClass,PyPep8Naming
@@ -931,11 +1715,15 @@ class ColorDescriptor_Video (ColorDescriptor_Base):
         # For each video, extract frames and submit colorDescriptor processing
         # jobs for each frame, combining all results into a single matrix for
         # return.
-        pool = multiprocessing.Pool(processes=descr_parallel)
+        # Threads rather than processes: each frame job is a colorDescriptor
+        # subprocess plus file I/O, during which the GIL is released, so
+        # worker processes would only add fork and task-pickling overhead.
+        pool = self._get_thread_pool(descr_parallel)
 
         # Mapping of [UID] to [frame] to tuple containing:
-        #   (info_fp, desc_fp, async processing result)
+        #   (info_fp, desc_fp)
         r_map = {}
+        frame_tasks = []
         with SimpleTimer("Extracting frames and submitting descriptor jobs...",
                          self._log.debug):
             for di in data_set:
@@ -956,47 +1744,52 @@ class ColorDescriptor_Video (ColorDescriptor_Base):
                 for frame, imgPath in fm.iteritems():
                     info_fp, desc_fp = \
                         self._get_standard_info_descriptors_filepath(di, frame)
-                    r = pool.apply_async(
-                        utils.generate_descriptors,
-                        args=(self.EXE, imgPath,
-                              self.descriptor_type(), info_fp, desc_fp)
-                    )
-                    r_map[di.uuid()][frame] = (info_fp, desc_fp, r)
+                    frame_tasks.append((di.uuid(), frame, self.EXE, imgPath,
+                                        self.descriptor_type(),
+                                        info_fp, desc_fp))
+                    r_map[di.uuid()][frame] = (info_fp, desc_fp)
 
                 # Clean temporary video file file while computing descriptors
                 # This does not remove the extracted frames that the underlying
                 #   detector/descriptor is working on.
                 di.clean_temp()
-        pool.close()
+
+        # Consume frame job results as they complete: with blocking get()
+        # calls in submission order, one slow frame would hold up shape
+        # collection for every faster frame queued behind it.
+        shape_results = pool.imap_unordered(_cd_frame_descriptor_job,
+                                            frame_tasks)
 
         # Each result is a tuple of two ndarrays: info and descriptor matrices
         with SimpleTimer("Collecting shape information for super matrices...",
                          self._log.debug):
+            # Mapping of [UID] to [frame] to (i_shape, d_shape)
+            frame_shapes = {}
+            for uid, frame, i_shape, d_shape, err in shape_results:
+                if err is not None:
+                    self._log.warning('Descriptor generation failed for '
+                                      'frame %d in video UID[%s]: %s',
+                                      frame, uid, err)
+                    continue
+                frame_shapes.setdefault(uid, {})[frame] = (i_shape, d_shape)
+
             running_height = 0
 
             i_width = None
             d_width = None
 
             # Transform r_map[uid] into:
-            #   (info_mat_files, desc_mat_files, sR, ssi_list)
+            #   (info_mat_files, desc_mat_files, frame_counts, sR, ssi_list)
             #   -> files in frame order
             uids = sorted(r_map)
             for uid in uids:
                 video_num_desc = 0
                 video_info_mat_fps = []  # ordered list of frame info mat files
                 video_desc_mat_fps = []  # ordered list of frame desc mat files
-                for frame in sorted(r_map[uid]):
-                    ifp, dfp, r = r_map[uid][frame]
-
-                    # Descriptor generation may have failed for this UID
-                    try:
-                        i_shape, d_shape = r.get()
-                    except RuntimeError, ex:
-                        self._log.warning('Descriptor generation failed for '
-                                          'frame %d in video UID[%s]: %s',
-                                          frame, uid, str(ex))
-                        r_map[uid] = None
-                        continue
+                video_frame_counts = []  # ordered per-frame descriptor counts
+                for frame in sorted(frame_shapes.get(uid, {})):
+                    ifp, dfp = r_map[uid][frame]
+                    i_shape, d_shape = frame_shapes[uid][frame]
 
                     if d_width is None and d_shape[0] != 0:
                         i_width = i_shape[1]
@@ -1009,50 +1802,71 @@ class ColorDescriptor_Video (ColorDescriptor_Base):
 
                     video_info_mat_fps.append(ifp)
                     video_desc_mat_fps.append(dfp)
+                    video_frame_counts.append(d_shape[0])
                     video_num_desc += d_shape[0]
 
                 # If combined descriptor height exceeds the per-item limit,
                 # generate a random subsample index list
                 ssi = None
                 if video_num_desc > per_item_limit:
-                    ssi = sorted(
-                        numpy.random.permutation(video_num_desc)[:per_item_limit]
-                    )
+                    ssi = _subsample_indices(video_num_desc, per_item_limit)
                     video_num_desc = len(ssi)
 
                 r_map[uid] = (video_info_mat_fps, video_desc_mat_fps,
-                              running_height, ssi)
+                              video_frame_counts, running_height, ssi)
                 running_height += video_num_desc
-        pool.join()
-        del pool
 
         with SimpleTimer("Building master descriptor matrices...",
                          self._log.debug):
-            master_info = numpy.zeros((running_height, i_width), dtype=float)
-            master_desc = numpy.zeros((running_height, d_width), dtype=float)
-            tp = multiprocessing.pool.ThreadPool(processes=self.parallel)
+            # float32 for the same reasons as the Image batch path.
+            master_info = numpy.zeros((running_height, i_width),
+                                      dtype=numpy.float32)
+            master_desc = numpy.zeros((running_height, d_width),
+                                      dtype=numpy.float32)
+            # Flat task list through a single map call, as in the Image batch
+            # path.
+            load_tasks = []
             for uid in uids:
-                info_fp_list, desc_fp_list, sR, ssi = r_map[uid]
-                tp.apply_async(ColorDescriptor_Video._thread_load_matrices,
-                               args=(master_info, info_fp_list, sR, ssi))
-                tp.apply_async(ColorDescriptor_Video._thread_load_matrices,
-                               args=(master_desc, desc_fp_list, sR, ssi))
-            tp.close()
-            tp.join()
+                info_fp_list, desc_fp_list, frame_counts, sR, ssi = r_map[uid]
+                load_tasks.append((master_info, info_fp_list, frame_counts,
+                                   sR, ssi))
+                load_tasks.append((master_desc, desc_fp_list, frame_counts,
+                                   sR, ssi))
+            # Same size as the frame-job pool above so the cached pool is
+            # reused instead of being torn down and rebuilt mid-call.
+            tp = self._get_thread_pool(descr_parallel)
+            tp.map(ColorDescriptor_Video._thread_load_matrices_task,
+                   load_tasks)
 
         return master_info, master_desc
 
     @staticmethod
-    def _thread_load_matrices(m, file_list, sR, subsample=None):
+    def _thread_load_matrices_task(task):
         """
-        load numpy matrices from files in ``file_list``, concatenating them
-        vertically. If a list of row indices is provided in ``subsample`` we
-        subsample those rows out of the concatenated matrix. This matrix is then
-        inserted into ``m`` starting at row ``sR``.
+        Unpack a single (master matrix, file list, row counts, start row,
+        subsample) tuple for use with ``ThreadPool.map``.
+        """
+        m, file_list, row_counts, sR, subsample = task
+        ColorDescriptor_Video._thread_load_matrices(m, file_list, row_counts,
+                                                    sR, subsample)
+
+    @staticmethod
+    def _thread_load_matrices(m, file_list, row_counts, sR, subsample=None):
         """
-        c = numpy.load(file_list[0])
-        for i in range(1, len(file_list)):
-            c = numpy.vstack((c, numpy.load(file_list[i])))
+        Load numpy matrices from files in ``file_list``, whose per-file row
+        counts are given in ``row_counts``, gathering them into a single
+        preallocated buffer. Gathering rows into known slices avoids the
+        repeated reallocate-and-copy of the whole accumulation that vstacking
+        per file would do. If a list of row indices is provided in
+        ``subsample`` we subsample those rows out of the combined matrix. The
+        result is then inserted into ``m`` starting at row ``sR``.
+        """
+        c = numpy.zeros((sum(row_counts), m.shape[1]), dtype=m.dtype)
+        i = 0
+        for fp, rows in zip(file_list, row_counts):
+            n = numpy.load(fp, mmap_mode='r', allow_pickle=False)
+            c[i:i+rows, :n.shape[1]] = n
+            i += rows
         if subsample:
             c = c[subsample, :]
         m[sR:sR+c.shape[0], :c.shape[1]] = c
@@ -1076,111 +1890,86 @@ valid_descriptor_types = [
     'rgbsift',
 ]
 
-
-def _create_image_descriptor_class(descriptor_type_str):
-    """
-    Create and return a ColorDescriptor class that operates over Image files
-    using the given descriptor type.
-    """
-    assert descriptor_type_str in valid_descriptor_types, \
-        "Given ColorDescriptor type was not valid! Given: %s. Expected one " \
-        "of: %s" % (descriptor_type_str, valid_descriptor_types)
-
-    # noinspection PyPep8Naming
-    class _cd_image_impl (ColorDescriptor_Image):
-        def descriptor_type(self):
-            """
-            :rtype: str
-            """
-            return descriptor_type_str
-
-    _cd_image_impl.__name__ = "ColorDescriptor_Image_%s" % descriptor_type_str
-    return _cd_image_impl
-
-
-def _create_video_descriptor_class(descriptor_type_str):
+# Hashed view for O(1) membership checks; the list above remains the
+# canonical ordered form for iteration and display.
+_valid_descriptor_types_set = frozenset(valid_descriptor_types)
+
+# Type string -> stable integer id (position in valid_descriptor_types).
+# Dispatch tables indexed by ``DESCRIPTOR_TYPE_ID`` can use plain sequence
+# indexing instead of string comparisons or dict hashing per lookup.
+descriptor_type_ids = dict(
+    (t, i) for i, t in enumerate(valid_descriptor_types)
+)
+
+
+# Members identical across every generated class, created once and copied
+# into each class dict rather than re-synthesized per factory call:
+# - empty __slots__: the leaves add no instance state of their own
+#   (instances still carry a __dict__ from the base classes, which hold all
+#   the configuration attributes);
+# - the descriptor_type accessor: a single classmethod object is a
+#   descriptor and binds correctly to whichever class it lands on, so no
+#   per-class lambda is needed.
+_cd_class_dict_template = {
+    '__slots__': (),
+    'descriptor_type': classmethod(lambda cls: cls.DESCRIPTOR_TYPE),
+}
+
+
+def _create_cd_class(base, name, descriptor_type_str):
     """
-    Create and return a ColorDescriptor class that operates over Video files
-    using the given descriptor type.
+    Create and return a ColorDescriptor class with the given name, operating
+    over the kind of input file the given base class handles, using the given
+    descriptor type.
     """
-    assert descriptor_type_str in valid_descriptor_types, \
-        "Given ColorDescriptor type was not valid! Given: %s. Expected one " \
-        "of: %s" % (descriptor_type_str, valid_descriptor_types)
-
-    # noinspection PyPep8Naming
-    class _cd_video_impl (ColorDescriptor_Video):
-        def descriptor_type(self):
-            """
-            :rtype: str
-            """
-            return descriptor_type_str
-
-    _cd_video_impl.__name__ = "ColorDescriptor_Video_%s" % descriptor_type_str
-    return _cd_video_impl
-
+    # An explicit raise rather than an assert: this guard must survive
+    # python -O, where a bad type string would otherwise produce a class
+    # that hands an invalid argument to the colorDescriptor executable.
+    if descriptor_type_str not in _valid_descriptor_types_set:
+        raise ValueError(
+            "Given ColorDescriptor type was not valid! Given: %s. Expected "
+            "one of: %s" % (descriptor_type_str, valid_descriptor_types)
+        )
+
+    # Intern the canonical type string so downstream equality checks against
+    # other interned literals short-circuit on identity.
+    descriptor_type_str = intern(descriptor_type_str)
+
+    d = dict(_cd_class_dict_template)
+    # Type string as a plain class attribute: hot-loop consumers can read it
+    # directly without a method call.
+    d['DESCRIPTOR_TYPE'] = descriptor_type_str
+    # Stable integer id for table-based dispatch.
+    d['DESCRIPTOR_TYPE_ID'] = descriptor_type_ids[descriptor_type_str]
+    return type(name, (base,), d)
+
+
+# (type string, Image class name, Video class name) per descriptor type,
+# formatted once and shared by the generation loop and the export list.
+valid_descriptor_types_named = tuple(
+    (t, 'ColorDescriptor_Image_%s' % t, 'ColorDescriptor_Video_%s' % t)
+    for t in valid_descriptor_types
+)
 
 # In order to allow multiprocessing, class types must be concretely assigned to
 # variables in the module. Dynamic generation causes issues with pickling (the
-# default data transmission protocol).
-
-ColorDescriptor_Image_rgbhistogram = _create_image_descriptor_class('rgbhistogram')
-ColorDescriptor_Image_opponenthistogram = _create_image_descriptor_class('opponenthistogram')
-ColorDescriptor_Image_huehistogram = _create_image_descriptor_class('huehistogram')
-ColorDescriptor_Image_nrghistogram = _create_image_descriptor_class('nrghistogram')
-ColorDescriptor_Image_transformedcolorhistogram = _create_image_descriptor_class('transformedcolorhistogram')
-ColorDescriptor_Image_colormoments = _create_image_descriptor_class('colormoments')
-ColorDescriptor_Image_colormomentinvariants = _create_image_descriptor_class('colormomentinvariants')
-ColorDescriptor_Image_sift = _create_image_descriptor_class('sift')
-ColorDescriptor_Image_huesift = _create_image_descriptor_class('huesift')
-ColorDescriptor_Image_hsvsift = _create_image_descriptor_class('hsvsift')
-ColorDescriptor_Image_opponentsift = _create_image_descriptor_class('opponentsift')
-ColorDescriptor_Image_rgsift = _create_image_descriptor_class('rgsift')
-ColorDescriptor_Image_csift = _create_image_descriptor_class('csift')
-ColorDescriptor_Image_rgbsift = _create_image_descriptor_class('rgbsift')
-
-ColorDescriptor_Video_rgbhistogram = _create_video_descriptor_class('rgbhistogram')
-ColorDescriptor_Video_opponenthistogram = _create_video_descriptor_class('opponenthistogram')
-ColorDescriptor_Video_huehistogram = _create_video_descriptor_class('huehistogram')
-ColorDescriptor_Video_nrghistogram = _create_video_descriptor_class('nrghistogram')
-ColorDescriptor_Video_transformedcolorhistogram = _create_video_descriptor_class('transformedcolorhistogram')
-ColorDescriptor_Video_colormoments = _create_video_descriptor_class('colormoments')
-ColorDescriptor_Video_colormomentinvariants = _create_video_descriptor_class('colormomentinvariants')
-ColorDescriptor_Video_sift = _create_video_descriptor_class('sift')
-ColorDescriptor_Video_huesift = _create_video_descriptor_class('huesift')
-ColorDescriptor_Video_hsvsift = _create_video_descriptor_class('hsvsift')
-ColorDescriptor_Video_opponentsift = _create_video_descriptor_class('opponentsift')
-ColorDescriptor_Video_rgsift = _create_video_descriptor_class('rgsift')
-ColorDescriptor_Video_csift = _create_video_descriptor_class('csift')
-ColorDescriptor_Video_rgbsift = _create_video_descriptor_class('rgbsift')
-
-
-cd_type_list = [
-    ColorDescriptor_Image_rgbhistogram,
-    ColorDescriptor_Video_rgbhistogram,
-    ColorDescriptor_Image_opponenthistogram,
-    ColorDescriptor_Video_opponenthistogram,
-    ColorDescriptor_Image_huehistogram,
-    ColorDescriptor_Video_huehistogram,
-    ColorDescriptor_Image_nrghistogram,
-    ColorDescriptor_Video_nrghistogram,
-    ColorDescriptor_Image_transformedcolorhistogram,
-    ColorDescriptor_Video_transformedcolorhistogram,
-    ColorDescriptor_Image_colormoments,
-    ColorDescriptor_Video_colormoments,
-    ColorDescriptor_Image_colormomentinvariants,
-    ColorDescriptor_Video_colormomentinvariants,
-    ColorDescriptor_Image_sift,
-    ColorDescriptor_Video_sift,
-    ColorDescriptor_Image_huesift,
-    ColorDescriptor_Video_huesift,
-    ColorDescriptor_Image_hsvsift,
-    ColorDescriptor_Video_hsvsift,
-    ColorDescriptor_Image_opponentsift,
-    ColorDescriptor_Video_opponentsift,
-    ColorDescriptor_Image_rgsift,
-    ColorDescriptor_Video_rgsift,
-    ColorDescriptor_Image_csift,
-    ColorDescriptor_Video_csift,
-    ColorDescriptor_Image_rgbsift,
-    ColorDescriptor_Video_rgbsift,
-]
+# default data transmission protocol), which is why the loop below binds each
+# generated class to its module-level name rather than replacing the family
+# with a single parameterized class.
+
+for _t, _img_name, _vid_name in valid_descriptor_types_named:
+    globals()[_img_name] = \
+        _create_cd_class(ColorDescriptor_Image, _img_name, _t)
+    globals()[_vid_name] = \
+        _create_cd_class(ColorDescriptor_Video, _vid_name, _t)
+del _t, _img_name, _vid_name
+
+
+# Image/Video pair per descriptor type, in valid_descriptor_types order (the
+# same ordering the previous hand-written list had). A tuple: the collection
+# is fixed at import and consumers only iterate it.
+cd_type_list = tuple(
+    globals()[name]
+    for t, img_name, vid_name in valid_descriptor_types_named
+    for name in (img_name, vid_name)
+)
@@ -1,11 +1,20 @@
+import os
+import shutil
+import tempfile
+import threading
 import unittest
 
 import mock
 import nose.tools as ntools
+import numpy
 
-from smqtk.algorithms.descriptor_generator.colordescriptor.colordescriptor import (
-    ColorDescriptor_Image_csift  # arbitrary leaf class
-)
+from smqtk.algorithms.descriptor_generator.colordescriptor import utils
+from smqtk.algorithms.descriptor_generator.colordescriptor.colordescriptor \
+    import (
+        ColorDescriptor_Image_csift,  # arbitrary leaf class
+        _subsample_indices,
+    )
+from smqtk.utils import video_utils
 
 __author__ = "paul.tunison@kitware.com"
 
@@ -39,3 +48,294 @@ if ColorDescriptor_Image_csift.is_usable():
             ntools.assert_equal(inst._flann_autotune, inst2._flann_autotune)
             ntools.assert_equal(inst._use_sp, inst2._use_sp)
             ntools.assert_equal(inst._rand_seed, inst2._rand_seed)
+
+
+#
+# The numeric helpers below never touch the colorDescriptor executable or IO
+# module, so their tests run regardless of ``is_usable``.
+#
+
+def _bare_instance(codebook, metric='euclidean', use_sq8=False, pq_m=0,
+                   model_dir='/nonexistent/model/dir'):
+    """
+    Construct a ColorDescriptor instance with just the runtime attributes the
+    quantization helpers consult, bypassing __init__ (which creates
+    directories and worker-pool state irrelevant here).
+    """
+    inst = ColorDescriptor_Image_csift.__new__(ColorDescriptor_Image_csift)
+    inst._model_dir = model_dir
+    inst._flann_distance_metric = metric
+    inst._use_sq8 = use_sq8
+    inst._pq_m = pq_m
+    inst._codebook = codebook
+    inst._codebook_f32 = None
+    inst._codebook_f32_sqnorm = None
+    inst._codebook_f32_lock = threading.Lock()
+    inst._codebook_sq8 = None
+    inst._hnsw_index = None
+    return inst
+
+
+def _reference_sp_hist(feas, bins):
+    """
+    Original per-region ``numpy.histogram`` spatial pyramid implementation,
+    kept as the behavioral reference for the fused bincount version.
+    """
+    bins = numpy.arange(0, bins + 1)
+    cordx = feas[:, 0]
+    cordy = feas[:, 1]
+    feas = feas[:, 2:]
+
+    hist_sp_g = numpy.histogram(feas, bins=bins)[0][numpy.newaxis]
+
+    midx = numpy.ceil(cordx.max() / 2)
+    midy = numpy.ceil(cordy.max() / 2)
+    lx = cordx < midx
+    rx = cordx >= midx
+    uy = cordy < midy
+    dy = cordy >= midy
+    hist_sp_q1 = numpy.histogram(feas[lx & uy], bins=bins)[0][numpy.newaxis]
+    hist_sp_q2 = numpy.histogram(feas[rx & uy], bins=bins)[0][numpy.newaxis]
+    hist_sp_q3 = numpy.histogram(feas[lx & dy], bins=bins)[0][numpy.newaxis]
+    hist_sp_q4 = numpy.histogram(feas[rx & dy], bins=bins)[0][numpy.newaxis]
+
+    ythird = numpy.ceil(cordy.max() / 3)
+    l1 = cordy <= ythird
+    l2 = (cordy > ythird) & (cordy <= 2 * ythird)
+    l3 = cordy > 2 * ythird
+    hist_sp_l1 = numpy.histogram(feas[l1], bins=bins)[0][numpy.newaxis]
+    hist_sp_l2 = numpy.histogram(feas[l2], bins=bins)[0][numpy.newaxis]
+    hist_sp_l3 = numpy.histogram(feas[l3], bins=bins)[0][numpy.newaxis]
+
+    return numpy.vstack((hist_sp_g, hist_sp_q1, hist_sp_q2, hist_sp_q3,
+                         hist_sp_q4, hist_sp_l1, hist_sp_l2, hist_sp_l3))
+
+
+class TestBuildSpHist (unittest.TestCase):
+
+    @staticmethod
+    def _random_feas(rs, n, bins, n_codes=10):
+        coords = rs.uniform(0, 200, size=(n, 2))
+        codes = rs.randint(0, bins, size=(n, n_codes))
+        return numpy.concatenate([coords, codes.astype(float)], axis=1)
+
+    def test_matches_reference_random(self):
+        for seed in range(5):
+            rs = numpy.random.RandomState(seed)
+            bins = rs.randint(8, 64)
+            feas = self._random_feas(rs, rs.randint(1, 500), bins)
+            ref = _reference_sp_hist(feas, bins)
+            new = ColorDescriptor_Image_csift._build_sp_hist(feas, bins)
+            ntools.assert_equal(new.shape, (8, bins))
+            numpy.testing.assert_array_equal(new, ref)
+
+    def test_matches_reference_single_point(self):
+        feas = numpy.array([[10.0, 20.0, 3.0, 1.0]])
+        ref = _reference_sp_hist(feas, 8)
+        new = ColorDescriptor_Image_csift._build_sp_hist(feas, 8)
+        numpy.testing.assert_array_equal(new, ref)
+
+    def test_matches_reference_boundary_coords(self):
+        # Points exactly on the quadrant/layer split lines exercise the
+        # >=/>-boundary handling.
+        rs = numpy.random.RandomState(0)
+        bins = 16
+        feas = self._random_feas(rs, 200, bins)
+        feas[:, :2] = numpy.round(feas[:, :2])
+        ref = _reference_sp_hist(feas, bins)
+        new = ColorDescriptor_Image_csift._build_sp_hist(feas, bins)
+        numpy.testing.assert_array_equal(new, ref)
+
+
+class TestSubsampleIndices (unittest.TestCase):
+
+    def test_contract(self):
+        # Exercise both sparse and dense sample ratios.
+        for n, k in ((1000, 10), (1000, 900), (10, 10), (5, 0)):
+            ssi = _subsample_indices(n, k)
+            ntools.assert_is_instance(ssi, list)
+            ntools.assert_equal(len(ssi), k)
+            ntools.assert_equal(len(set(ssi)), k)
+            ntools.assert_equal(ssi, sorted(ssi))
+            for i in ssi:
+                ntools.assert_true(0 <= i < n)
+
+
+class TestSq8Quantization (unittest.TestCase):
+
+    def test_params_and_roundtrip(self):
+        rs = numpy.random.RandomState(0)
+        cb = rs.uniform(0, 0.1, size=(32, 24))
+        scale, offset = ColorDescriptor_Image_csift._sq8_params(cb)
+        ntools.assert_greater(scale, 0)
+
+        q = ColorDescriptor_Image_csift._sq8_quantize(cb, scale, offset)
+        ntools.assert_equal(q.dtype, numpy.int8)
+        ntools.assert_equal(q.shape, cb.shape)
+        # Codebook values span the parameter derivation range, so none
+        # should have been clipped and dequantization error is bounded by
+        # half a quantization step.
+        ntools.assert_true(
+            numpy.all(numpy.abs(q * scale + offset - cb) <= scale / 2.0 + 1e-9)
+        )
+
+    def test_constant_codebook(self):
+        cb = numpy.full((4, 8), 0.25)
+        scale, offset = ColorDescriptor_Image_csift._sq8_params(cb)
+        ntools.assert_greater(scale, 0)
+        q = ColorDescriptor_Image_csift._sq8_quantize(cb, scale, offset)
+        numpy.testing.assert_array_equal(q, numpy.zeros(cb.shape,
+                                                        numpy.int8))
+
+
+class TestQuantizeHelpers (unittest.TestCase):
+
+    K = 32
+    D = 24
+    N = 300
+
+    def setUp(self):
+        rs = numpy.random.RandomState(42)
+        # Histogram-like non-negative data, as colorDescriptor emits.
+        self.codebook = rs.uniform(0, 0.1, size=(self.K, self.D))
+        self.descriptors = rs.uniform(0, 0.1, size=(self.N, self.D)) \
+                             .astype(numpy.float32)
+
+    def test_quantize_l2(self):
+        inst = _bare_instance(self.codebook)
+        idxs = inst._quantize_l2(self.descriptors)
+        x = self.descriptors.astype(numpy.float32)
+        cb = self.codebook.astype(numpy.float32)
+        d2 = ((x[:, numpy.newaxis, :] - cb[numpy.newaxis, :, :]) ** 2) \
+            .sum(axis=2)
+        numpy.testing.assert_array_equal(idxs, d2.argmin(axis=1))
+
+    def test_quantize_l2_sq8(self):
+        inst = _bare_instance(self.codebook, use_sq8=True)
+        idxs = inst._quantize_l2_sq8(self.descriptors)
+        # Brute-force argmin in the shared quantized domain.
+        scale, offset = inst._sq8_params(self.codebook)
+        cbq = inst._sq8_quantize(self.codebook, scale, offset) \
+                  .astype(numpy.int64)
+        xq = inst._sq8_quantize(self.descriptors, scale, offset) \
+                 .astype(numpy.int64)
+        d2 = ((xq[:, numpy.newaxis, :] - cbq[numpy.newaxis, :, :]) ** 2) \
+            .sum(axis=2)
+        numpy.testing.assert_array_equal(idxs, d2.argmin(axis=1))
+
+    def test_quantize_chi2(self):
+        inst = _bare_instance(self.codebook, metric='chi_square')
+        idxs = inst._quantize_chi2(self.descriptors)
+        x = self.descriptors.astype(numpy.float64)
+        cb = self.codebook.astype(numpy.float64)
+        num = (x[:, numpy.newaxis, :] - cb[numpy.newaxis, :, :]) ** 2
+        den = x[:, numpy.newaxis, :] + cb[numpy.newaxis, :, :]
+        d = numpy.where(den > 0, num / numpy.where(den > 0, den, 1), 0) \
+            .sum(axis=2)
+        numpy.testing.assert_array_equal(idxs, d.argmin(axis=1))
+
+    def test_quantize_pq(self):
+        m, sub_k = 4, 16
+        sub_d = self.D // m
+        rs = numpy.random.RandomState(7)
+        pq_cb = rs.uniform(0, 0.1, size=(m, sub_k, sub_d))
+        inst = _bare_instance(pq_cb, pq_m=m)
+        idxs = inst._quantize_pq(self.descriptors)
+        ntools.assert_equal(idxs.shape, (self.N, m))
+        x = self.descriptors.astype(numpy.float32) \
+                .reshape(self.N, m, sub_d)
+        cb = pq_cb.astype(numpy.float32)
+        for j in range(m):
+            d2 = ((x[:, j, numpy.newaxis, :]
+                   - cb[j][numpy.newaxis, :, :]) ** 2).sum(axis=2)
+            numpy.testing.assert_array_equal(idxs[:, j], d2.argmin(axis=1))
+
+    def test_quantize_pq_flat_codebook_error(self):
+        # Flat 2-D codebook under a pq_subspaces configuration must raise
+        # rather than die unpacking shapes.
+        inst = _bare_instance(self.codebook, pq_m=4)
+        ntools.assert_raises_regexp(
+            ValueError, "flat",
+            inst._quantize_pq, self.descriptors
+        )
+
+    def test_quantize_pq_dimension_mismatch_error(self):
+        pq_cb = numpy.zeros((4, 16, 6))
+        inst = _bare_instance(pq_cb, pq_m=4)
+        ntools.assert_raises_regexp(
+            ValueError, "dimensionality",
+            inst._quantize_pq, numpy.zeros((5, 10), numpy.float32)
+        )
+
+
+class TestGetMetadataInfoCache (unittest.TestCase):
+
+    def setUp(self):
+        fd, self.video_path = tempfile.mkstemp(suffix='.mp4')
+        os.close(fd)
+
+    def tearDown(self):
+        st = os.stat(self.video_path)
+        video_utils._metadata_info_cache.pop(
+            (self.video_path, st.st_mtime, st.st_size, 'ffprobe'), None
+        )
+        os.remove(self.video_path)
+
+    @mock.patch('smqtk.utils.video_utils.subprocess.Popen')
+    def test_cache_hit_skips_probe(self, mock_popen):
+        st = os.stat(self.video_path)
+        md = video_utils.VideoMetadata()
+        video_utils._metadata_info_cache[
+            (self.video_path, st.st_mtime, st.st_size, 'ffprobe')
+        ] = md
+        ntools.assert_is(video_utils.get_metadata_info(self.video_path), md)
+        ntools.assert_false(mock_popen.called)
+
+
+class TestGenerateDescriptorsMulti (unittest.TestCase):
+
+    def setUp(self):
+        self.work_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.work_dir)
+
+    def _checkpoint_paths(self, dtype_str):
+        return (os.path.join(self.work_dir, '%s.info.npy' % dtype_str),
+                os.path.join(self.work_dir, '%s.descr.npy' % dtype_str))
+
+    def test_existing_checkpoints_skip_execution(self):
+        # With all per-type checkpoint files present, no subprocess or image
+        # read should occur -- only header-level shape loads.
+        types = ['csift', 'rgsift']
+        info_paths = []
+        descr_paths = []
+        shapes = []
+        for i, t in enumerate(types):
+            ip, dp = self._checkpoint_paths(t)
+            info = numpy.zeros((10 + i, 5), numpy.float32)
+            descr = numpy.zeros((10 + i, 384), numpy.float32)
+            numpy.save(ip, info)
+            numpy.save(dp, descr)
+            info_paths.append(ip)
+            descr_paths.append(dp)
+            shapes.append((info.shape, descr.shape))
+
+        with mock.patch.object(utils, 'DescriptorIO', new=object()):
+            with mock.patch.object(
+                    utils, '_generate_descriptors_with_spacing') as m_gen:
+                results = utils.generate_descriptors_multi(
+                    'colorDescriptor', '/no/such/image.png', types,
+                    info_paths, descr_paths
+                )
+        ntools.assert_false(m_gen.called)
+        ntools.assert_equal(results, shapes)
+
+    def test_requires_descriptorio(self):
+        with mock.patch.object(utils, 'DescriptorIO', new=None):
+            ntools.assert_raises(
+                ImportError,
+                utils.generate_descriptors_multi,
+                'colorDescriptor', '/no/such/image.png', ['csift'],
+                ['i.npy'], ['d.npy']
+            )
@@ -29,10 +29,23 @@ class VideoMetadata (object):
         self.duration = None
 
 
+# Process-wide cache of probe results keyed on the video file's
+# (path, mtime, size) and the probe executable used. Multiple descriptor
+# instances processing the same video each probe it otherwise, paying an
+# ffprobe subprocess per call for an answer that cannot change while the
+# file is unchanged.
+_metadata_info_cache = {}
+
+
 def get_metadata_info(video_filepath, ffprobe_exe='ffprobe'):
     """
     Use ffmpeg to extract video file metadata parameters
 
+    Results are cached per process against the file's path, modification
+    time and size, so repeat probes of an unchanged file skip the ffprobe
+    subprocess. The returned instance may therefore be shared between
+    callers and should be treated as read-only.
+
     :param video_filepath: File path to the video to probe.
     :type video_filepath: str
 
@@ -46,6 +59,15 @@ def get_metadata_info(video_filepath, ffprobe_exe='ffprobe'):
     log = logging.getLogger('smqtk.utils.video_utils.get_metadata_info')
     re_float_match = "[+-]?(?:(?:\d+\.?\d*)|(?:\.\d+))(?:[eE][+-]?\d+)?"
 
+    try:
+        st = os.stat(video_filepath)
+        cache_key = (video_filepath, st.st_mtime, st.st_size, ffprobe_exe)
+    except OSError:
+        # Probe will fail below with a more informative error.
+        cache_key = None
+    if cache_key is not None and cache_key in _metadata_info_cache:
+        return _metadata_info_cache[cache_key]
+
     log.debug("Using ffprobe: %s", ffprobe_exe)
     cmd = [ffprobe_exe, '-i', video_filepath]
     p = subprocess.Popen(cmd, stdout=subprocess.PIPE,
@@ -97,6 +119,8 @@ def get_metadata_info(video_filepath, ffprobe_exe='ffprobe'):
     md.fps = fps
     md.duration = duration
 
+    if cache_key is not None:
+        _metadata_info_cache[cache_key] = md
     return md
 
 